@@ -1,5 +1,6 @@
+import re
 import streamlit as st
-import json
+import orjson
 import pandas as pd
 import plotly.express as px
 from typing import List, Dict
@@ -75,6 +76,73 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
+# --- Cached analytics ---
+# Streamlit reruns the whole script on every widget interaction; cache the
+# expensive market-data computations keyed on the (hashable) holdings tuple
+# so unchanged portfolios don't re-hit yfinance.
+
+def _stocks_key(stocks: Dict[str, float]) -> tuple:
+    return tuple(sorted(stocks.items()))
+
+
+def _portfolio_from(stocks_key: tuple) -> Portfolio:
+    p = Portfolio()
+    p.stocks = dict(stocks_key)
+    return p
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def compute_sector_breakdown(stocks_key: tuple):
+    return _portfolio_from(stocks_key).sector_breakdown()
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def compute_sector_df(stocks_key: tuple) -> pd.DataFrame:
+    return _portfolio_from(stocks_key).sector_breakdown_df()
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def compute_ticker_vols(stocks_key: tuple, period: str = "3mo"):
+    return _portfolio_from(stocks_key).ticker_volatilities(period)
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def compute_portfolio_vol(stocks_key: tuple, period: str = "3mo"):
+    return _portfolio_from(stocks_key).portfolio_volatility(period)
+
+
+@st.cache_data(ttl=900, show_spinner=False)
+def compute_report_blobs(stocks_key: tuple):
+    """Report dict plus its serialized JSON/Markdown download blobs."""
+    report = _portfolio_from(stocks_key).generate_report()
+    report_json = orjson.dumps(
+        report, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS, default=str
+    ).decode()
+    md_lines = [
+        "# FinSight AI Report",
+        "",
+        "## AI Summary",
+        report.get("ai_summary", ""),
+        "",
+        "## Sector Breakdown",
+    ]
+    for s, w in report.get("sectors", []):
+        md_lines.append(f"- {s}: {w:.1f}%")
+    md_lines.extend([
+        "",
+        "## Portfolio Volatility",
+        str(report.get("portfolio_volatility")),
+    ])
+    return report, report_json, "\n".join(md_lines)
+
+
+@st.cache_resource(ttl=900, show_spinner=False)
+def compute_holdings_data(stocks_key: tuple):
+    # cache_resource: holdings dicts are large and we don't want Streamlit
+    # deep-hashing them on every rerun
+    return _portfolio_from(stocks_key).get_portfolio_data()
+
+
 # --- Keep portfolio persistent in session ---
 if "portfolio" not in st.session_state:
     st.session_state.portfolio = Portfolio()
@@ -84,6 +152,21 @@ portfolio: Portfolio = st.session_state.portfolio
 # --- Sidebar: Portfolio builder ---
 st.sidebar.header("Portfolio Builder")
 
+# One compiled pattern pulls all TICKER:WEIGHT pairs in a single C-level
+# scan — no nested split()/strip() passes over the input.
+_PORTFOLIO_RE = re.compile(r"([A-Za-z.\-]+)\s*:\s*([0-9]*\.?[0-9]+)")
+
+quick_input = st.sidebar.text_input(
+    "Quick add (TICKER:WEIGHT, ...)", placeholder="AAPL:0.5, MSFT:0.3, GOOGL:0.2"
+)
+if st.sidebar.button("Apply quick add") and quick_input:
+    parsed = {t: float(w) for t, w in _PORTFOLIO_RE.findall(quick_input)}
+    if parsed:
+        portfolio.bulk_set(parsed)
+        st.sidebar.success("Portfolio applied ✅")
+    else:
+        st.sidebar.error("No TICKER:WEIGHT pairs found.")
+
 sample_portfolios: Dict[str, List[Dict[str, float]]] = {
     "Tech Growth": [
         {"Ticker": "AAPL", "Weight": 0.40},
@@ -128,12 +211,11 @@ edit_df = st.sidebar.data_editor(
 
 if st.sidebar.button("Apply portfolio"):
     try:
-        portfolio.stocks = {}
-        for _, row in edit_df.dropna().iterrows():
-            t = str(row.get("Ticker", "")).strip()
-            w = float(row.get("Weight", 0.0) or 0.0)
-            if t:
-                portfolio.add_stock(t, w)
+        # vectorized column extraction — iterrows() allocates a Series per row
+        rows = edit_df.dropna(subset=["Ticker"])
+        tickers = rows["Ticker"].astype(str).to_numpy()
+        weights = rows["Weight"].fillna(0.0).astype(float).to_numpy()
+        portfolio.bulk_set(dict(zip(tickers, weights)))
         st.sidebar.success("Portfolio applied ✅")
     except Exception as e:
         st.sidebar.error(f"Failed to apply portfolio: {e}")
@@ -146,24 +228,14 @@ st.markdown("</div>", unsafe_allow_html=True)
 
 has_positions = bool(portfolio.stocks)
 
-def compute_diversification_text(breakdown: List):
-    if not breakdown:
-        return "Unknown"
-    top = breakdown[0][1]
-    if top >= 60.0:
-        return "Poor"
-    if len(breakdown) < 3:
-        return "Moderate"
-    return "Good"
-
 # ---- Top KPIs ----
 col_k1, col_k2, col_k3, col_k4 = st.columns(4)
 if has_positions:
-    sectors = portfolio.sector_breakdown()
-    pvol = portfolio.portfolio_volatility()
+    sectors = compute_sector_breakdown(_stocks_key(portfolio.stocks))
+    pvol = compute_portfolio_vol(_stocks_key(portfolio.stocks))
     num_holdings = len(portfolio.stocks)
     top_sector = sectors[0][0] if sectors else "Unknown"
-    diversification = compute_diversification_text(sectors)
+    diversification = Portfolio.classify_diversification(sectors)
     col_k1.metric("Holdings", num_holdings)
     col_k2.metric("Top sector", top_sector)
     col_k3.metric("Diversification", diversification)
@@ -184,13 +256,12 @@ with tab_overview:
     else:
         c1, c2 = st.columns([1, 1])
         # Sector pie
-        sectors = portfolio.sector_breakdown()
-        if sectors:
-            df_sect = pd.DataFrame(sectors, columns=["Sector", "Weight %"])
+        df_sect = compute_sector_df(_stocks_key(portfolio.stocks))
+        if not df_sect.empty:
             fig_pie = px.pie(df_sect, names="Sector", values="Weight %", title="Sector breakdown")
             c1.plotly_chart(fig_pie, use_container_width=True)
         # Volatility bars
-        vols = portfolio.ticker_volatilities()
+        vols = compute_ticker_vols(_stocks_key(portfolio.stocks))
         if vols:
             df_vol = pd.DataFrame([
                 {"Ticker": t, "Ann. Volatility": v} for t, v in vols.items()
@@ -201,13 +272,13 @@ with tab_overview:
 
         st.markdown("---")
         st.subheader("AI Portfolio Insight")
-        with st.spinner("Generating insight..."):
-            insight_text = portfolio.ai_portfolio_insight(audience="Beginner")
-        st.markdown(f"<div class='markdown-insight'>{insight_text}</div>", unsafe_allow_html=True)
+        # stream tokens as Gemini produces them instead of blocking on the
+        # full completion behind a spinner
+        st.write_stream(portfolio.ai_portfolio_insight(audience="Beginner", stream=True))
 
         st.markdown("---")
         st.subheader("Holdings snapshot")
-        data = portfolio.get_portfolio_data()
+        data = compute_holdings_data(_stocks_key(portfolio.stocks))
         df_hold = pd.DataFrame([
             {
                 "Ticker": t,
@@ -252,30 +323,11 @@ with tab_report:
         st.info("Add positions to generate a report.")
     else:
         with st.spinner("Generating report..."):
-            report = portfolio.generate_report()
+            report, report_json, md_blob = compute_report_blobs(_stocks_key(portfolio.stocks))
 
         st.write("AI summary:")
         st.markdown(f"<div class='markdown-insight'>{report.get('ai_summary','')}</div>", unsafe_allow_html=True)
 
-        report_json = json.dumps(report, indent=2, default=str)
         st.download_button("Download JSON", report_json, file_name="finsight_report.json", mime="application/json")
-
-        # Simple markdown export
-        md_lines = [
-            "# FinSight AI Report",
-            "",
-            "## AI Summary",
-            report.get("ai_summary", ""),
-            "",
-            "## Sector Breakdown",
-        ]
-        for s, w in report.get("sectors", []):
-            md_lines.append(f"- {s}: {w:.1f}%")
-        md_lines.extend([
-            "",
-            "## Portfolio Volatility",
-            str(report.get("portfolio_volatility")),
-        ])
-        md_blob = "\n".join(md_lines)
         st.download_button("Download Markdown", md_blob, file_name="finsight_report.md", mime="text/markdown")
 
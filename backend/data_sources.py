@@ -8,6 +8,12 @@ load_dotenv()
 NEWSAPI_KEY = os.getenv("NEWSAPI_KEY")
 ALPHA_KEY   = os.getenv("ALPHAVANTAGE_API_KEY")
 
+# Shared session: keep-alive reuses the TCP/TLS connection across calls
+# instead of paying a fresh handshake per request.
+_SESSION = requests.Session()
+if NEWSAPI_KEY:
+    _SESSION.headers.update({"X-Api-Key": NEWSAPI_KEY})
+
 def get_price_timeseries(ticker: str, period="5d", interval="1d"):
     """Historical OHLCV using yfinance (no API key needed)."""
     t = yf.Ticker(ticker)
@@ -31,9 +37,11 @@ def get_latest_news(query: str, page_size=5):
     """Uses NewsAPI if key present, otherwise returns empty list."""
     if not NEWSAPI_KEY:
         return []
-    url = ("https://newsapi.org/v2/everything?"
-           f"q={requests.utils.quote(query)}&language=en&sortBy=publishedAt&pageSize={page_size}")
-    r = requests.get(url, headers={"X-Api-Key": NEWSAPI_KEY}, timeout=20)
+    r = _SESSION.get(
+        "https://newsapi.org/v2/everything",
+        params={"q": query, "language": "en", "sortBy": "publishedAt", "pageSize": page_size},
+        timeout=20,
+    )
     r.raise_for_status()
     articles = r.json().get("articles", [])
     # Compact representation
@@ -1,5 +1,7 @@
 # llm.py
+import functools
 import os
+from typing import Iterator
 from dotenv import load_dotenv
 import google.generativeai as genai
 
@@ -8,6 +10,20 @@ load_dotenv()
 genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
 MODEL_NAME = "gemini-1.5-flash"
 
+# Construct the model once at import — the constructor resolves auth/config,
+# so rebuilding it per call just adds overhead on the hot LLM path.
+try:
+    _MODEL = genai.GenerativeModel(MODEL_NAME)
+except Exception:
+    _MODEL = None
+
+# Failure sentinel: callers that cache LLM output compare against this so
+# a transient outage never gets memoized as the real completion.
+AI_UNAVAILABLE = (
+    "Portfolio insight unavailable: AI service not configured. "
+    "Please set GEMINI_API_KEY."
+)
+
 # --- 1. Stock-level summarization ---
 def summarize_market(ticker, profile, prices_df, news_list, audience="Beginner"):
     """Combine structured data + news into a single Gemini summary."""
@@ -34,19 +50,33 @@ Requirements:
 - If news_list is empty, say no fresh headlines found.
 - End with a one-sentence risk or watch-out.
 """
-    model = genai.GenerativeModel(MODEL_NAME)
-    res = model.generate_content(prompt)
+    res = _MODEL.generate_content(prompt)
     return res.text.strip()
 
 # --- 2. Generic summarizer wrapper ---
+@functools.lru_cache(maxsize=256)
+def _cached_generate(prompt: str) -> str:
+    # Identical prompts (e.g. revisiting a tab with an unchanged portfolio)
+    # short-circuit to the cached completion instead of re-billing Gemini.
+    # Exceptions are not cached, so transient failures retry.
+    res = _MODEL.generate_content(prompt)
+    return res.text.strip()
+
+
 def ai_summary(prompt: str) -> str:
     """Simple wrapper to generate a short summary (used for portfolio insights)."""
     try:
-        model = genai.GenerativeModel(MODEL_NAME)
-        res = model.generate_content(prompt)
-        return res.text.strip()
+        return _cached_generate(prompt)
     except Exception as e:
-        return (
-            "Portfolio insight unavailable: AI service not configured. "
-            "Please set GEMINI_API_KEY."
-        )
+        return AI_UNAVAILABLE
+
+
+def ai_summary_stream(prompt: str) -> Iterator[str]:
+    """Streaming variant of ai_summary — yields text chunks as Gemini
+    produces them (pairs with st.write_stream for perceived latency)."""
+    try:
+        for chunk in _MODEL.generate_content(prompt, stream=True):
+            if chunk.text:
+                yield chunk.text
+    except Exception:
+        yield AI_UNAVAILABLE
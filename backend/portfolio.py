@@ -1,10 +1,41 @@
 # backend/portfolio.py
+import functools
+import json
 import math
-from typing import Dict, List, Tuple
+from collections import defaultdict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Mapping, Tuple
+import numpy as np
 import yfinance as yf
 import pandas as pd
+from curl_cffi import requests as curl_requests
+from sklearn.covariance import LedoitWolf
+
+from backend.llm import AI_UNAVAILABLE, ai_summary, ai_summary_stream  # wrappers in llm.py
+from backend._kernels import compute_vols
+
+# one fused view of the portfolio: everything analyze_risk and
+# ai_portfolio_insight need, derived from a single data pass
+Snapshot = namedtuple("Snapshot", ["sectors", "vols", "pvol", "info"])
+
+
+# One pooled session shared by every yfinance call: keep-alive reuses the
+# TCP/TLS connection instead of paying a fresh handshake per ticker.
+# Yahoo's API rejects plain requests.Session — yfinance insists on a
+# curl_cffi session with browser impersonation.
+_SESSION = curl_requests.Session(impersonate="chrome")
+
+
+# Process-level memoization of the raw yfinance calls: separate Portfolio
+# instances (Streamlit cache wrappers, tests) hit the network once per
+# ticker instead of once per instance. invalidate() clears these too.
+@functools.lru_cache(maxsize=512)
+def _download_info(ticker: str) -> Dict:
+    try:
+        return yf.Ticker(ticker, session=_SESSION).info or {}
+    except Exception:
+        return {}
 
-from backend.llm import ai_summary  # uses your wrapper in llm.py
 
 class Portfolio:
     """
@@ -16,154 +47,385 @@ class Portfolio:
     - Produces a portfolio-level AI insight (using Gemini)
     """
     def __init__(self):
-        self.stocks = {}
+        self._stocks: Dict[str, float] = {}
+        # SoA mirror of the holdings dict: contiguous arrays that the
+        # vectorized analytics consume directly, kept aligned on mutation
+        self._tickers: np.ndarray = np.empty(0, dtype=object)
+        self._weights: np.ndarray = np.empty(0, dtype=np.float64)
+        # per-ticker caches so one report doesn't re-hit yfinance N times
+        self._info_cache: Dict[str, Dict] = {}
+        self._closes_cache: Dict[Tuple[Tuple[str, ...], str], pd.DataFrame] = {}
+        self._rets_cache: Dict[Tuple[Tuple[str, ...], str], Tuple[List[str], np.ndarray]] = {}
+        self._cov_cache: Dict[Tuple[Tuple[str, ...], str], np.ndarray] = {}
+        self._blurb_cache: Dict[str, str] = {}
+        self._insight_cache: Dict[Tuple, str] = {}
+        self._sector_df: pd.DataFrame = None
+        self._sector_cache: Tuple[Tuple[str, float], ...] = None
+        self._by_sector: Dict[str, List[str]] = None
+
+    def invalidate(self) -> None:
+        """Clear cached market data (call after editing the portfolio)."""
+        self._info_cache.clear()
+        self._closes_cache.clear()
+        self._rets_cache.clear()
+        self._cov_cache.clear()
+        self._blurb_cache.clear()
+        self._insight_cache.clear()
+        self._sector_df = None
+        self._sector_cache = None
+        self._by_sector = None
+        _download_info.cache_clear()
+
+    @property
+    def stocks(self) -> Dict[str, float]:
+        return self._stocks
+
+    @stocks.setter
+    def stocks(self, items: Dict[str, float]) -> None:
+        self._stocks = dict(items)
+        self._rebuild_arrays()
+
+    def _rebuild_arrays(self) -> None:
+        n = len(self._stocks)
+        self._tickers = np.array(list(self._stocks), dtype=object)
+        self._weights = np.fromiter(
+            (float(w) for w in self._stocks.values()), dtype=np.float64, count=n
+        )
+        # holdings changed — cached derived results are stale
+        self._sector_df = None
+        self._sector_cache = None
+        self._by_sector = None
+        self._insight_cache.clear()
 
     # ---- CRUD ----
     def add_stock(self, ticker: str, weight: float = 1.0) -> str:
         ticker = ticker.upper().strip()
-        if ticker and ticker not in self.stocks:
-            self.stocks[ticker]=weight
+        if ticker and ticker not in self._stocks:
+            self._stocks[ticker] = weight
+            self._rebuild_arrays()
             return f"{ticker} added to portfolio."
         return f"{ticker} already exists."
 
+    def add_stocks(self, tickers: List[str], weight: float = 1.0) -> List[str]:
+        """
+        Add several tickers at once: one array rebuild instead of one per
+        add, then a single multi-symbol download to warm the history
+        cache rather than a fetch per ticker.
+        """
+        messages = []
+        for t in tickers:
+            t = t.upper().strip()
+            if t and t not in self._stocks:
+                self._stocks[t] = weight
+                messages.append(f"{t} added to portfolio.")
+            else:
+                messages.append(f"{t} already exists.")
+        self._rebuild_arrays()
+        if self._stocks:
+            self._fetch_history_bulk()
+        return messages
+
+    def bulk_set(self, items: Mapping[str, float]) -> None:
+        """
+        Replace all holdings in one shot (parser/editor path): normalize
+        once here instead of per-call upper/strip + dedupe in add_stock.
+        """
+        self.stocks = {
+            k.upper().strip(): float(v) for k, v in items.items() if k.strip()
+        }
+        self.invalidate()
+
     def remove_stock(self, ticker: str) -> str:
         ticker = ticker.upper().strip()
-        if ticker in self.stocks:
-            del self.stocks[ticker]
+        if ticker in self._stocks:
+            del self._stocks[ticker]
+            self._rebuild_arrays()
             return f"{ticker} removed from portfolio."
         return f"{ticker} not found in portfolio."
 
     # ---- Data pulls ----
     def _fetch_info(self, ticker: str) -> Dict:
-        try:
-            return yf.Ticker(ticker).info or {}
-        except Exception:
-            return {}
+        if ticker in self._info_cache:
+            return self._info_cache[ticker]
+        info = _download_info(ticker)
+        self._info_cache[ticker] = info
+        return info
 
-    def _fetch_history(self, ticker: str, period: str = "3mo") -> pd.DataFrame:
+    def _ensure_info(self) -> Dict[str, Dict]:
+        """
+        Warm the info cache for all holdings concurrently and return it.
+        yfinance calls are network-bound, so threads overlap the per-ticker
+        latency; every analytics pass then reads the same dict.
+        """
+        missing = [t for t in self.stocks if t not in self._info_cache]
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(8, len(missing))) as ex:
+                list(ex.map(self._fetch_info, missing))
+        return self._info_cache
+
+    def _fetch_history_bulk(self, period: str = "3mo") -> pd.DataFrame:
+        """
+        Wide Close-price frame (one column per ticker) from a single
+        multi-symbol yf.download call instead of one request per ticker.
+        """
+        key = (tuple(self.stocks), period)
+        if key in self._closes_cache:
+            return self._closes_cache[key]
         try:
-            df = yf.Ticker(ticker).history(period=period, interval="1d")
-            if isinstance(df, pd.DataFrame) and not df.empty:
-                df = df.reset_index()
-            return df
+            df = yf.download(
+                list(self.stocks),
+                period=period,
+                interval="1d",
+                group_by="column",
+                auto_adjust=False,
+                threads=True,
+                progress=False,
+                session=_SESSION,
+            )
+            closes = df["Close"] if "Close" in df else pd.DataFrame()
+            if isinstance(closes, pd.Series):
+                # single-ticker downloads come back without the ticker level
+                closes = closes.to_frame(name=next(iter(self.stocks)))
+            closes = closes.dropna(how="all")
         except Exception:
-            return pd.DataFrame()
+            closes = pd.DataFrame()
+        self._closes_cache[key] = closes
+        return closes
+
+    def _returns_matrix(self, period: str = "3mo") -> Tuple[List[str], np.ndarray]:
+        """
+        Aligned (T-1, N) daily-returns matrix for the tickers with
+        available history, cached per (holdings, period) so repeated
+        volatility queries reuse one ndarray. Stored as float32 — daily
+        returns fit comfortably, and halving the bytes moved doubles the
+        SIMD lanes for the std/cov kernels.
+        """
+        key = (tuple(self.stocks), period)
+        if key in self._rets_cache:
+            return self._rets_cache[key]
+        closes = self._fetch_history_bulk(period)
+        cols = [t for t in self._tickers if t in closes.columns]
+        arr = closes[cols].to_numpy(dtype=np.float32) if cols else np.empty((0, 0))
+        if arr.shape[0] >= 2:
+            rets = arr[1:] / arr[:-1] - np.float32(1.0)
+        else:
+            rets = np.empty((0, len(cols)), dtype=np.float32)
+        self._rets_cache[key] = (cols, rets)
+        return cols, rets
+
+    def _covariance(self, rets: np.ndarray, period: str) -> np.ndarray:
+        """
+        Daily covariance of the (NaN-masked) returns matrix, cached per
+        (holdings, period). Uses Ledoit-Wolf shrinkage when there are
+        enough observations — better conditioned than the sample estimate
+        and computed in one C-level pass — else falls back to np.cov.
+        """
+        key = (tuple(self.stocks), period)
+        if key in self._cov_cache:
+            return self._cov_cache[key]
+        if rets.shape[1] >= 2 and rets.shape[0] > rets.shape[1]:
+            cov = LedoitWolf().fit(rets).covariance_
+        else:
+            cov = np.atleast_2d(np.cov(rets, rowvar=False))
+        self._cov_cache[key] = cov
+        return cov
+
+    def _batch_stock_blurbs(self, tickers: List[str]) -> Dict[str, str]:
+        """
+        One Gemini call for all uncached tickers (asks for a JSON map)
+        instead of one LLM roundtrip per stock.
+        """
+        missing = [t for t in tickers if t not in self._blurb_cache]
+        if missing:
+            prompt = (
+                "Give a brief non-advisory stock overview (2-3 sentences) for each "
+                f"of these tickers: {', '.join(missing)}.\n"
+                "Respond with only a JSON object mapping ticker to overview, "
+                'e.g. {"AAPL": "..."}.'
+            )
+            raw = ai_summary(prompt)
+            if raw != AI_UNAVAILABLE:  # never memoize the failure fallback
+                try:
+                    text = raw.strip()
+                    if "{" in text:  # tolerate ```json fences around the object
+                        text = text[text.find("{"):text.rfind("}") + 1]
+                    blurbs = json.loads(text)
+                except Exception:
+                    blurbs = {}
+                for t in missing:
+                    if t in blurbs:
+                        self._blurb_cache[t] = blurbs[t]
+        return {t: self._blurb_cache.get(t, "Summary unavailable.") for t in tickers}
 
     # ---- Snapshots ----
     def get_portfolio_data(self) -> Dict[str, Dict]:
         data = {}
+        info_map = self._ensure_info()
+        blurbs = self._batch_stock_blurbs(list(self.stocks))
         for t in self.stocks:
-            info = self._fetch_info(t)
+            info = info_map.get(t, {})
             data[t] = {
                 "name": info.get("longName", "N/A"),
                 "sector": info.get("sector", "Unknown"),
                 "marketCap": info.get("marketCap", 0) or 0,
                 "forwardPE": info.get("forwardPE", None),
-                # quick blurb per stock (reuses your ai_summary wrapper)
-                "summary": ai_summary(f"Give a brief non-advisory stock overview for {t}.")
+                "summary": blurbs.get(t, "Summary unavailable.")
             }
         return data
 
     # ---- Analytics ----
-    def sector_breakdown(self) -> List[Tuple[str, float]]:
+    @staticmethod
+    def classify_diversification(sectors: Tuple[Tuple[str, float], ...]) -> str:
+        """Shared Poor/Moderate/Good call used by the app, insight, and risk."""
+        if not sectors:
+            return "Unknown"
+        if sectors[0][1] >= 60.0:
+            return "Poor"
+        if len(sectors) < 3:
+            return "Moderate"
+        return "Good"
+
+    @staticmethod
+    def high_vol_tickers(vols: Dict[str, float], threshold: float = 0.40) -> List[str]:
+        return [t for t, v in vols.items() if isinstance(v, float) and v >= threshold]
+
+    @property
+    def by_sector(self) -> Dict[str, List[str]]:
+        """
+        sector -> tickers inverted index, built once per holdings change;
+        reads are then a dict iteration over at most a dozen sectors.
         """
-        Returns list of (sector, weight_pct) sorted desc.
+        if self._by_sector is None:
+            info_map = self._ensure_info()
+            index: Dict[str, List[str]] = defaultdict(list)
+            for t in self.stocks:
+                index[info_map.get(t, {}).get("sector", "Unknown")].append(t)
+            self._by_sector = dict(index)
+        return self._by_sector
+
+    def sector_breakdown(self) -> Tuple[Tuple[str, float], ...]:
+        """
+        Returns tuple of (sector, weight_pct) sorted desc, cached until
+        holdings change (immutable, so callers can iterate it freely).
         Uses marketCap for weights when available, otherwise equal-weight.
         """
         if not self.stocks:
-            return []
-
-        # collect sectors + caps
-        sector_weights: Dict[str, float] = {}
-        for t,w in self.stocks.items():
-            info = self._fetch_info(t)
-            sector = info.get("sector", "Unknown")
-            sector_weights[sector] = sector_weights.get(sector, 0.0) + float(w)
-        breakdown = [(s, pct * 100.0) for s, pct in sector_weights.items()]
-        breakdown.sort(key=lambda x: x[1], reverse=True)
-        return breakdown   
-
-        
+            return ()
+        if self._sector_cache is not None:
+            return self._sector_cache
+
+        self._sector_cache = tuple(sorted(
+            (
+                (s, sum(float(self._stocks[t]) for t in tickers) * 100.0)
+                for s, tickers in self.by_sector.items()
+            ),
+            key=lambda kv: -kv[1],
+        ))
+        return self._sector_cache
+
+    def sector_breakdown_df(self) -> pd.DataFrame:
+        """
+        Sector breakdown as a cached DataFrame — what the UI consumes —
+        so reruns don't rebuild the frame from tuples each time.
+        """
+        if self._sector_df is None:
+            self._sector_df = pd.DataFrame(
+                self.sector_breakdown(), columns=["Sector", "Weight %"]
+            )
+        return self._sector_df
 
     def ticker_volatilities(self, period: str = "3mo") -> Dict[str, float]:
         """
         Annualized volatility per ticker using daily Close returns.
         """
-        vols: Dict[str, float] = {}
-        for t in self.stocks:
-            hist = self._fetch_history(t, period=period)
-            if hist is None or hist.empty or "Close" not in hist.columns:
-                vols[t] = float("nan")
-                continue
-            ret = hist["Close"].pct_change().dropna()
-            if ret.empty:
-                vols[t] = float("nan")
-                continue
-            daily_std = float(ret.std())
-            ann_vol = daily_std * math.sqrt(252.0)
-            vols[t] = ann_vol
+        if not self.stocks:
+            return {}
+        closes = self._fetch_history_bulk(period)
+        vols: Dict[str, float] = {t: float("nan") for t in self.stocks}
+        cols = [t for t in self.stocks if t in closes.columns]
+        if not cols:
+            return vols
+        arr = closes[cols].to_numpy(dtype=np.float64)
+        col_vols = compute_vols(arr)
+        for t, v in zip(cols, col_vols):
+            vols[t] = float(v)
         return vols
 
     def portfolio_volatility(self, period: str = "3mo") -> float:
         """
-        Equal-weight portfolio annualized volatility (simple).
+        Weighted portfolio annualized volatility as the quadratic form
+        sqrt(w @ Sigma @ w) — one BLAS-backed covariance pass on the
+        cached returns matrix.
         """
         if not self.stocks:
             return float("nan")
-        # Build return DataFrame
-        rets = []
-        for t in self.stocks:
-            h = self._fetch_history(t, period=period)
-            if h is None or h.empty or "Close" not in h.columns:
-                continue
-            r = h[["Date", "Close"]].copy()
-            r[t] = r["Close"].pct_change()
-            r = r.dropna()[["Date", t]]
-            rets.append(r.set_index("Date"))
-        if not rets:
+        cols, rets = self._returns_matrix(period)
+        if not cols:
             return float("nan")
-        R = pd.concat(rets, axis=1).dropna()
-        if R.empty:
+        rets = rets[~np.isnan(rets).any(axis=1)]
+        if rets.shape[0] < 2:
             return float("nan")
-        # normalize weights
-        weights = pd.Series(self.stocks, index=R.columns, dtype=float)
+        # normalize weights (column order follows self._tickers)
+        avail = np.array([t in set(cols) for t in self._tickers], dtype=bool)
+        weights = self._weights[avail]
         weights = weights / weights.sum()
-        
-        # portfolio return = weighted sum of daily returns
-        port_ret = R.mul(weights, axis=1).sum(axis=1)
-        ann_vol = float(port_ret.std() * math.sqrt(252.0))
-        return ann_vol
+        cov = self._covariance(rets, period)
+        daily_var = float(weights @ cov @ weights)
+        return math.sqrt(max(daily_var, 0.0) * 252.0)
     def volatility(self, ticker: str, period: str = "3mo") -> float:
-        return self.ticker_volatilities(period).get(ticker, float("nan"))
+        """Annualized volatility for one ticker off the cached returns matrix."""
+        ticker = ticker.upper().strip()
+        cols, rets = self._returns_matrix(period)
+        if ticker not in cols:
+            return float("nan")
+        col = rets[:, cols.index(ticker)]
+        col = col[~np.isnan(col)]
+        if col.size < 2:
+            return float("nan")
+        return float(col.std(ddof=1) * math.sqrt(252.0))
+
+    def _snapshot(self, period: str = "3mo") -> Snapshot:
+        """
+        Gather sectors, volatilities, and portfolio vol in one pass.
+        The bulk-history and info caches make this a single download even
+        though several derived metrics are produced.
+        """
+        return Snapshot(
+            sectors=self.sector_breakdown(),
+            vols=self.ticker_volatilities(period),
+            pvol=self.portfolio_volatility(period),
+            info=self._ensure_info(),
+        )
 
 
     # ---- AI Insight ----
-    def ai_portfolio_insight(self, audience: str = "Beginner") -> str:
-        
+    def ai_portfolio_insight(self, audience: str = "Beginner", stream: bool = False):
         """
         LLM summary of portfolio composition + risks.
+        With stream=True, returns a generator of text chunks instead of
+        the full string (for st.write_stream).
         """
         if not self.stocks:
-            return "Portfolio is empty. Add some tickers first."
+            msg = "Portfolio is empty. Add some tickers first."
+            return iter([msg]) if stream else msg
+
+        # same holdings + audience -> same insight; skip the data gather
+        # and the LLM roundtrip entirely
+        cache_key = (tuple(sorted(self._stocks.items())), audience)
+        cached = self._insight_cache.get(cache_key)
+        if cached is not None:
+            return iter([cached]) if stream else cached
 
-        # gather basics
-        data = self.get_portfolio_data()
-        sectors = self.sector_breakdown()
-        vols = self.ticker_volatilities()
-        pvol = self.portfolio_volatility()
+        # gather basics (info only — the per-stock blurbs aren't needed here,
+        # so the one LLM call below stays the only one)
+        snap = self._snapshot()
+        info_map, sectors, vols, pvol = snap.info, snap.sectors, snap.vols, snap.pvol
 
         # simple flags
         top_sector = sectors[0] if sectors else ("Unknown", 0)
         concentration_flag = (top_sector[1] >= 60.0)
-        high_vol_names = [t for t, v in vols.items() if isinstance(v, float) and v >= 0.40]
-
-        # diversification score
-        if concentration_flag:
-            diversification_score = "Poor"
-        elif len(sectors) < 3:
-            diversification_score = "Moderate"
-        else:
-            diversification_score = "Good"
+        high_vol_names = self.high_vol_tickers(vols)
+        diversification_score = self.classify_diversification(sectors)
 
         # risk classification (based on vol + diversification)
         if pvol != pvol:  # NaN check
@@ -185,12 +447,13 @@ class Portfolio:
 
         # build a compact context for the LLM
         basics = []
-        for t, info in data.items():
+        for t in self.stocks:
+            info = info_map.get(t, {})
             basics.append({
                 "ticker": t,
-                "name": info.get("name", "N/A"),
+                "name": info.get("longName", "N/A"),
                 "sector": info.get("sector", "Unknown"),
-                "mcap": info.get("marketCap", 0)
+                "mcap": info.get("marketCap", 0) or 0
             })
 
         prompt = f"""
@@ -221,7 +484,23 @@ class Portfolio:
     • 1–2 de-risking categories (e.g., “add defensive sectors”), no stock picks.
     - End with a single caveat: this is NOT financial advice.
     """
-        return ai_summary(prompt)
+        if stream:
+            def _stream_and_cache():
+                parts = []
+                for chunk in ai_summary_stream(prompt):
+                    parts.append(chunk)
+                    yield chunk
+                # a mid-stream failure yields the sentinel as the last
+                # chunk, so check it rather than the joined text — partial
+                # output plus the sentinel would slip past a whole-string
+                # comparison and memoize a truncated insight
+                if parts and parts[-1] != AI_UNAVAILABLE:
+                    self._insight_cache[cache_key] = "".join(parts)
+            return _stream_and_cache()
+        text = ai_summary(prompt)
+        if text != AI_UNAVAILABLE:  # don't memoize a transient outage
+            self._insight_cache[cache_key] = text
+        return text
 
     def analyze_risk(self, period: str = "3mo") -> Dict:
         """
@@ -230,13 +509,12 @@ class Portfolio:
         if not self.stocks:
             return {"error": "Portfolio is empty."}
 
-        vols = self.ticker_volatilities(period)
-        pvol = self.portfolio_volatility(period)
-        sectors = self.sector_breakdown()
+        snap = self._snapshot(period)
+        sectors, vols, pvol = snap.sectors, snap.vols, snap.pvol
 
         top_sector = sectors[0] if sectors else ("Unknown", 0)
         concentration_flag = (top_sector[1] >= 60.0)
-        high_vol_names = [t for t, v in vols.items() if isinstance(v, float) and v >= 0.40]
+        high_vol_names = self.high_vol_tickers(vols)
 
         return {
             "portfolio_volatility": round(pvol, 3) if pvol == pvol else None,
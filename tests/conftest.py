@@ -0,0 +1,74 @@
+import functools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend import portfolio as portfolio_module
+from backend.portfolio import Portfolio
+
+# Deterministic synthetic market data: seeded random walks plus canned
+# info payloads, so the suite is CPU-only and repeatable — no live
+# yfinance calls, no cassette recording run needed.
+_RNG = np.random.default_rng(0)
+_DATES = pd.bdate_range("2024-01-02", periods=63)
+
+
+def _walk(start):
+    steps = _RNG.normal(0.0005, 0.015, len(_DATES))
+    return start * np.cumprod(1.0 + steps)
+
+
+_CANNED_CLOSES = pd.DataFrame(
+    {"AAPL": _walk(180.0), "MSFT": _walk(410.0)}, index=_DATES
+)
+
+_CANNED_INFO = {
+    "AAPL": {
+        "longName": "Apple Inc.",
+        "sector": "Technology",
+        "marketCap": 3_000_000_000_000,
+        "forwardPE": 28.0,
+    },
+    "MSFT": {
+        "longName": "Microsoft Corporation",
+        "sector": "Technology",
+        "marketCap": 3_100_000_000_000,
+        "forwardPE": 31.0,
+    },
+}
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fake_market_data():
+    """Serve the canned payloads from the module-level fetch seams.
+
+    Session-scoped so the patches are in place before any other session
+    fixture (notably ``portfolio``) touches the network.
+    """
+    def fake_bulk(self, period="3mo"):
+        cols = [t for t in self.stocks if t in _CANNED_CLOSES.columns]
+        return _CANNED_CLOSES[cols]
+
+    with pytest.MonkeyPatch.context() as mp:
+        # lru_cache keeps the real seam's interface — Portfolio.invalidate()
+        # calls _download_info.cache_clear()
+        mp.setattr(
+            portfolio_module, "_download_info",
+            functools.lru_cache(maxsize=512)(
+                lambda ticker: _CANNED_INFO.get(ticker, {})
+            ),
+        )
+        mp.setattr(Portfolio, "_fetch_history_bulk", fake_bulk)
+        yield
+
+
+@pytest.fixture(scope="session")
+def portfolio(fake_market_data):
+    """
+    One shared AAPL+MSFT portfolio for the whole suite — market data is
+    fetched once instead of per test.
+    """
+    p = Portfolio()
+    p.add_stocks(["AAPL", "MSFT"])
+    return p
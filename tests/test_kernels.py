@@ -0,0 +1,21 @@
+import numpy as np
+
+from backend._kernels import compute_vols
+
+
+def test_compute_vols_skips_missing_values():
+    # a single missing close must not poison the column (or its neighbours)
+    closes = np.array(
+        [
+            [100.0, 200.0],
+            [101.0, 198.0],
+            [np.nan, 202.0],
+            [103.0, 199.0],
+            [102.0, 201.0],
+            [104.0, 203.0],
+        ]
+    )
+    vols = compute_vols(closes)
+    assert vols.shape == (2,)
+    assert np.isfinite(vols).all()
+    assert (vols > 0).all()